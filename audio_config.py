@@ -1,8 +1,47 @@
+import os
+import re
 import sys
+import json
+import time
 import pyaudio
 import requests
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from InquirerPy import prompt
 
+from utils import get_cache_dir
+
+# Shared session so Hugging Face API calls reuse pooled keep-alive connections
+_HF_SESSION = requests.Session()
+_HF_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+))
+
+OPUS_MT_MODELS_URL = 'https://huggingface.co/api/models?search=opus-mt'
+OPUS_MT_MODELS_CACHE_TTL = 24 * 60 * 60  # seconds
+# Helsinki-NLP/opus-mt-{source}-{destination}, one model ID per line
+OPUS_MT_MODEL_ID_PATTERN = re.compile(r"^Helsinki-NLP/opus-mt-([^-\n]+)-([^-\n]+)$", re.M)
+
+# PortAudio scans for devices when it is first initialized and only rescans once every PyAudio
+# instance is terminated; audio_processing keeps one alive for the whole session, so the device
+# list can't change while the app runs and is probed once per process
+@lru_cache(maxsize=None)
+def list_devices():
+    """
+    List every audio device, probing PortAudio only on the first call.
+
+    Returns:
+        tuple: The PyAudio device info dictionary of each device, in device index order.
+    """
+    p = pyaudio.PyAudio()
+    try:
+        return tuple(p.get_device_info_by_index(i) for i in range(p.get_device_count()))
+    finally:
+        p.terminate()
+
 def list_audio_sources():
     """
     List available audio input devices.
@@ -10,29 +49,95 @@ def list_audio_sources():
     Returns:
         list: A list of dictionaries, each containing the name and index of an audio input device.
     """
-    p = pyaudio.PyAudio()
     sources = []
-    for i in range(p.get_device_count()):
-        info = p.get_device_info_by_index(i)
+    for i, info in enumerate(list_devices()):
         if info["maxInputChannels"] > 0:
             device_name = f"{info['name']} (Index: {i})"
             sources.append({"name": device_name, "index": i})
-    p.terminate()
     return sources
 
+def _read_models_cache(cache_path: str):
+    """
+    Read the cached OPUS-MT model list from disk.
+
+    Args:
+        cache_path (str): The path of the cache file.
+
+    Returns:
+        dict: The cache entry with "etag", "fetched_at" and "models" keys, or None if unavailable.
+    """
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if isinstance(cache.get('models'), list):
+            # A damaged timestamp or ETag only costs a revalidation; the models are still usable
+            if not isinstance(cache.get('fetched_at'), (int, float)):
+                cache['fetched_at'] = 0
+            if not isinstance(cache.get('etag'), str):
+                cache['etag'] = None
+            return cache
+    except (OSError, ValueError, AttributeError):
+        pass
+    return None
+
+def _write_models_cache(cache_path: str, etag, models: list) -> None:
+    """
+    Atomically write the OPUS-MT model list to the disk cache.
+
+    Args:
+        cache_path (str): The path of the cache file.
+        etag (str): The ETag returned by the Hugging Face API, if any.
+        models (list): The list of models to cache.
+    """
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({"etag": etag, "fetched_at": time.time(), "models": models}, f)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        # Caching is best effort; the freshly fetched list is still usable
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
 def fetch_opus_mt_models():
     """
     Fetch the list of available OPUS-MT models from Hugging Face.
 
+    The list is cached on disk. A cache younger than OPUS_MT_MODELS_CACHE_TTL is used
+    as is; an older one is revalidated with a conditional request, and is used as a
+    fallback when Hugging Face cannot be reached.
+
     Returns:
         list: A list of models from the Hugging Face API.
     """
     try:
-        response = requests.get('https://huggingface.co/api/models?search=opus-mt')
+        cache_path = os.path.join(get_cache_dir(), 'opus_mt_models.json')
+    except OSError:
+        # The cache is best effort; without a usable cache directory, always fetch
+        cache_path = None
+    cache = _read_models_cache(cache_path) if cache_path else None
+    if cache and time.time() - cache.get('fetched_at', 0) < OPUS_MT_MODELS_CACHE_TTL:
+        return cache['models']
+
+    headers = {}
+    if cache and cache.get('etag'):
+        headers['If-None-Match'] = cache['etag']
+
+    try:
+        response = _HF_SESSION.get(OPUS_MT_MODELS_URL, headers=headers, timeout=(3.05, 10))
+        if response.status_code == 304 and cache:
+            _write_models_cache(cache_path, cache['etag'], cache['models'])
+            return cache['models']
         response.raise_for_status()
         models = response.json()
+        if cache_path:
+            _write_models_cache(cache_path, response.headers.get('ETag'), models)
         return models
     except requests.RequestException as e:
+        if cache:
+            return cache['models']
         print(f"Error fetching OPUS-MT models: {e}")
         sys.exit(1)
 
@@ -46,22 +151,13 @@ def extract_languages(models):
     Returns:
         tuple: A sorted list of source languages and a dictionary mapping source languages to sets of destination languages.
     """
-    source_languages = set()
     destination_languages = {}
+    joined_ids = "\n".join(model['modelId'] for model in models)
+    for match in OPUS_MT_MODEL_ID_PATTERN.finditer(joined_ids):
+        source, destination = match.group(1, 2)
+        destination_languages.setdefault(source, set()).add(destination)
 
-    for model in models:
-        model_id = model['modelId']
-        if model_id.startswith('Helsinki-NLP/opus-mt'):
-            parts = model_id.split('-')
-            if len(parts) == 5:  # Ensure the format Helsinki-NLP/opus-mt-{source}-{destination}
-                source = parts[3]
-                destination = parts[4]
-                source_languages.add(source)
-                if source not in destination_languages:
-                    destination_languages[source] = set()
-                destination_languages[source].add(destination)
-
-    return sorted(source_languages), destination_languages
+    return sorted(destination_languages), destination_languages
 
 def select_audio_sources_and_languages():
     """
@@ -1,185 +1,506 @@
 import math
-import time
+import os
+import atexit
+import asyncio
+import shutil
+import importlib.util
 import torch
 import numpy as np
-from transformers import WhisperForConditionalGeneration, WhisperProcessor, pipeline
+from transformers import AutoTokenizer, BitsAndBytesConfig, WhisperForConditionalGeneration, WhisperProcessor, pipeline
 import webrtcvad
-import queue
 import threading
 import pyaudio
+from collections import OrderedDict, deque
 from concurrent.futures import ThreadPoolExecutor
-from typing import Dict, Tuple
+from functools import wraps
+from typing import Dict, List, Tuple
 
-from utils import format_error_message
+from utils import NotifiableDeque, format_error_message, get_cache_dir
 
-p = None
+try:
+    import ctranslate2
+except ImportError:
+    ctranslate2 = None
 
-def load_models(source_language: str, destination_language: str, device: torch.device) -> Tuple[WhisperForConditionalGeneration, WhisperProcessor, pipeline]:
-    transcription_model = WhisperForConditionalGeneration.from_pretrained("openai/whisper-base").to(device)
-    transcription_model.config.forced_decoder_ids = None
-    processor = WhisperProcessor.from_pretrained("openai/whisper-base", clean_up_tokenization_spaces=False)
+# One PortAudio session shared by every capture stream
+_PA = pyaudio.PyAudio()
+atexit.register(_PA.terminate)
 
-    translation_pipeline = pipeline("translation", model=f"Helsinki-NLP/opus-mt-{source_language}-{destination_language}", device=device, clean_up_tokenization_spaces=False)
+MAX_BATCH_SIZE = 8  # audio chunks per Whisper generate call
+TRANSLATION_CACHE_SIZE = 2048
 
-    return transcription_model, processor, translation_pipeline
+# Whisper is shared by every source; translation pipelines are shared per language pair
+_WHISPER: WhisperForConditionalGeneration = None
+_PROCESSOR: WhisperProcessor = None
+_DECODER_PROMPTS: Dict[str, List[Tuple[int, int]]] = {}
+_TRANSLATORS: Dict[Tuple[str, str], object] = {}
+# Models may be loaded from several threads: Whisper is guarded by one lock, translation
+# pipelines by one lock per language pair so different pairs load concurrently
+_WHISPER_LOCK = threading.Lock()
+_TRANSLATOR_LOCKS: Dict[Tuple[str, str], threading.Lock] = {}
+_TRANSLATOR_LOCKS_GUARD = threading.Lock()
 
-def capture_audio(source_index: int, source_name: str, source_language: str, destination_language: str, callback, error_callback, executor: ThreadPoolExecutor) -> None:
-    global p
+# Interim transcriptions of a growing utterance often repeat, so translations are cached
+_translation_cache: OrderedDict = OrderedDict()
+# Last interim transcription shown per source, to avoid re-emitting identical updates
+_last_interim: Dict[str, str] = {}
+
+class AudioCoalescer:
+    """
+    Hands captured audio chunks from the capture coroutines to the processing coroutine.
+
+    Chunks are kept in a deque per source. A new chunk replaces a trailing interim
+    chunk of the same source, since it contains the same audio and more, while final
+    chunks are always kept until they have been processed. Must be used from the
+    event loop's thread.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[str, deque] = {}
+        self._ready = asyncio.Event()
+
+    def put(self, message: Tuple[str, np.ndarray, str, str, bool]) -> None:
+        """
+        Queue an audio chunk, superseding the source's unprocessed interim chunk.
+
+        Args:
+            message (tuple): The (source_name, audio_data, source_language, destination_language, final) chunk.
+        """
+        chunks = self._pending.setdefault(message[0], deque())
+        if chunks and not chunks[-1][4]:
+            chunks[-1] = message
+        else:
+            chunks.append(message)
+        self._ready.set()
+
+    async def take(self, max_items: int) -> List[Tuple[str, np.ndarray, str, str, bool]]:
+        """
+        Wait until audio is pending, then take the oldest chunk of up to max_items sources.
+
+        Args:
+            max_items (int): The maximum number of chunks to take.
+
+        Returns:
+            list: At most one chunk per source.
+        """
+        while not self._pending:
+            self._ready.clear()
+            await self._ready.wait()
+        batch = []
+        for source_name in list(self._pending)[:max_items]:
+            chunks = self._pending.pop(source_name)
+            batch.append(chunks.popleft())
+            if chunks:
+                # Re-insert at the end so other sources are served first next time
+                self._pending[source_name] = chunks
+        return batch
+
+def get_model_dtype(device: torch.device) -> torch.dtype:
+    """
+    Pick the reduced-precision dtype used for inference on the given device.
+
+    Args:
+        device (torch.device): The device the models run on.
+
+    Returns:
+        torch.dtype: float16 on CUDA and MPS, bfloat16 on CPUs with native bfloat16
+            support, float32 on other CPUs.
+    """
+    if device.type in ("cuda", "mps"):
+        return torch.float16
+    # Without AVX512-BF16 or AMX, bfloat16 matmuls are emulated and slower than float32
+    if torch.ops.mkldnn._is_mkldnn_bf16_supported():
+        return torch.bfloat16
+    return torch.float32
+
+class CTranslate2Pipeline:
+    """
+    Translation callable backed by an int8-quantized CTranslate2 model.
+
+    Mirrors the parts of the transformers translation pipeline interface used here:
+    it accepts a string or a list of strings and returns a list of dictionaries with
+    a "translation_text" key.
+    """
+
+    def __init__(self, model_name: str, model_dir: str) -> None:
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, clean_up_tokenization_spaces=False)
+        self.translator = ctranslate2.Translator(model_dir, device="cpu", compute_type="int8")
+
+    def __call__(self, texts, batch_size: int = 32, **kwargs) -> List[Dict[str, str]]:
+        if isinstance(texts, str):
+            texts = [texts]
+        source_tokens = [self.tokenizer.convert_ids_to_tokens(self.tokenizer.encode(text)) for text in texts]
+        results = self.translator.translate_batch(source_tokens, max_batch_size=batch_size, beam_size=4)
+        return [
+            {"translation_text": self.tokenizer.decode(
+                self.tokenizer.convert_tokens_to_ids(result.hypotheses[0]),
+                skip_special_tokens=True
+            )}
+            for result in results
+        ]
+
+def convert_translation_model(model_name: str) -> str:
+    """
+    Convert a translation model to an int8 CTranslate2 model, reusing earlier conversions.
+
+    Args:
+        model_name (str): The Hugging Face model name.
+
+    Returns:
+        str: The directory holding the converted model.
+    """
+    model_dir = os.path.join(get_cache_dir(), "ct2", f"{model_name.replace('/', '--')}-int8")
+    if not os.path.isfile(os.path.join(model_dir, "model.bin")):
+        # Convert next to the target and move it into place so an interrupted run is redone
+        temp_dir = f"{model_dir}.{os.getpid()}.tmp"
+        ctranslate2.converters.TransformersConverter(model_name).convert(temp_dir, quantization="int8", force=True)
+        shutil.rmtree(model_dir, ignore_errors=True)
+        os.replace(temp_dir, model_dir)
+    return model_dir
+
+def load_translation_pipeline(model_name: str, device: torch.device, dtype: torch.dtype):
+    """
+    Load a translation model, quantized to int8 where a backend for the device is available.
+
+    Args:
+        model_name (str): The Hugging Face model name.
+        device (torch.device): The device the model runs on.
+        dtype (torch.dtype): The dtype used when the model is not quantized.
+
+    Returns:
+        A callable with the transformers translation pipeline interface.
+    """
+    if device.type == "cpu" and ctranslate2 is not None:
+        try:
+            return CTranslate2Pipeline(model_name, convert_translation_model(model_name))
+        except OSError:
+            pass  # no writable cache for the converted model; use the transformers pipeline
+    if device.type == "cuda" and importlib.util.find_spec("bitsandbytes") is not None:
+        return pipeline(
+            "translation",
+            model=model_name,
+            device_map={"": device.index or 0},
+            model_kwargs={"quantization_config": BitsAndBytesConfig(load_in_8bit=True)},
+            clean_up_tokenization_spaces=False
+        )
+    return pipeline("translation", model=model_name, device=device, torch_dtype=dtype, clean_up_tokenization_spaces=False)
+
+def compile_encoder(transcription_model: WhisperForConditionalGeneration, forced_decoder_ids: List[Tuple[int, int]], max_batch_size: int) -> None:
+    """
+    Compile the Whisper encoder with TorchInductor and trigger compilation with warm-up runs.
+
+    Mel inputs are always (batch, 80, 3000), but the batch holds one chunk per source of a
+    language, so a graph is compiled for every batch size from 1 to max_batch_size before
+    live audio arrives. If compiling fails at any point (for example when Triton is
+    unavailable), the eager encoder is used from then on.
+
+    Args:
+        transcription_model (WhisperForConditionalGeneration): The Whisper model, already on its device.
+        forced_decoder_ids (List[Tuple[int, int]]): The decoder prompt used for the warm-up runs.
+        max_batch_size (int): The largest batch the encoder will be called with.
+    """
+    encoder = transcription_model.model.encoder
+    eager_forward = encoder.forward
+    # The default mode doesn't capture CUDA graphs, whose state is kept per thread; warm-up
+    # runs on a loader thread, inference on the processing executor
+    compiled_forward = torch.compile(eager_forward, dynamic=False)
+
+    # wraps keeps the eager signature, which generate inspects to pick encoder arguments
+    @wraps(eager_forward)
+    def forward(*args, **kwargs):
+        try:
+            return compiled_forward(*args, **kwargs)
+        except Exception:
+            encoder.forward = eager_forward
+            return eager_forward(*args, **kwargs)
+
+    encoder.forward = forward
+    with torch.inference_mode():
+        for batch_size in range(1, max_batch_size + 1):
+            if encoder.forward is eager_forward:
+                break
+            transcription_model.generate(
+                input_features=torch.zeros(
+                    (batch_size, transcription_model.config.num_mel_bins, 3000),
+                    dtype=transcription_model.dtype,
+                    device=transcription_model.device
+                ),
+                forced_decoder_ids=forced_decoder_ids,
+                max_new_tokens=1
+            )
+
+def load_models(source_language: str, destination_language: str, device: torch.device, max_batch_size: int = 1) -> Tuple[WhisperForConditionalGeneration, WhisperProcessor, pipeline, List[Tuple[int, int]]]:
+    global _WHISPER, _PROCESSOR
+    dtype = get_model_dtype(device)
+
+    language_pair = (source_language, destination_language)
+    with _TRANSLATOR_LOCKS_GUARD:
+        translator_lock = _TRANSLATOR_LOCKS.setdefault(language_pair, threading.Lock())
+    with translator_lock:
+        if language_pair not in _TRANSLATORS:
+            _TRANSLATORS[language_pair] = load_translation_pipeline(f"Helsinki-NLP/opus-mt-{source_language}-{destination_language}", device, dtype)
+
+    with _WHISPER_LOCK:
+        whisper_loaded = _WHISPER is None
+        if whisper_loaded:
+            _WHISPER = WhisperForConditionalGeneration.from_pretrained(
+                "openai/whisper-base",
+                torch_dtype=dtype,
+                attn_implementation="sdpa"
+            ).to(device)
+            _WHISPER.config.forced_decoder_ids = None
+            _WHISPER.generation_config.return_timestamps = False
+            _PROCESSOR = WhisperProcessor.from_pretrained("openai/whisper-base", clean_up_tokenization_spaces=False)
+
+        # Resolve the language/task prompt once instead of on every generate call
+        if source_language not in _DECODER_PROMPTS:
+            _DECODER_PROMPTS[source_language] = _PROCESSOR.get_decoder_prompt_ids(language=source_language, task="transcribe")
+        forced_decoder_ids = _DECODER_PROMPTS[source_language]
+
+        if whisper_loaded and device.type == "cuda":
+            compile_encoder(_WHISPER, forced_decoder_ids, min(max_batch_size, MAX_BATCH_SIZE))
+
+    return _WHISPER, _PROCESSOR, _TRANSLATORS[language_pair], forced_decoder_ids
+
+async def capture_audio(source_index: int, source_name: str, source_language: str, destination_language: str, callback) -> None:
+    loop = asyncio.get_running_loop()
+    stream = None
     try:
-        p = pyaudio.PyAudio()
         vad = webrtcvad.Vad()
         vad.set_mode(1)  # Aggressiveness level
 
-        stream = p.open(format=pyaudio.paInt16,
-                        channels=1,
-                        rate=16000,
-                        input=True,
-                        input_device_index=source_index,
-                        frames_per_buffer=160)  # Small chunks
+        # PortAudio delivers 30 ms windows (the longest frame webrtcvad accepts) on its own
+        # thread; the callback only copies them into a ring buffer and wakes this coroutine
+        window_samples = 480
+        ring_windows = 64
+        ring = np.empty(window_samples * ring_windows, dtype=np.int16)
+        windows_ready = asyncio.Semaphore(0)
+        captured_windows = 0
+
+        def on_audio(in_data, frame_count, time_info, status):
+            nonlocal captured_windows
+            start = (captured_windows % ring_windows) * window_samples
+            ring[start:start + window_samples] = np.frombuffer(in_data, dtype=np.int16)
+            captured_windows += 1
+            loop.call_soon_threadsafe(windows_ready.release)
+            return (None, pyaudio.paContinue)
+
+        stream = _PA.open(format=pyaudio.paInt16,
+                          channels=1,
+                          rate=16000,
+                          input=True,
+                          input_device_index=source_index,
+                          frames_per_buffer=window_samples,
+                          stream_callback=on_audio)
 
-        buffer = []
         silent_time = 0
         speaking_time = 0
         min_silent_duration = 0.1  # seconds
-        min_duration = 30  # seconds for Whisper model
+        max_duration = 30  # seconds of audio Whisper transcribes at once
         time_threshold = 1
+        min_onset_windows = 2  # consecutive speech windows needed to start an utterance
+        onset_windows = 0
         is_speaking = False
 
+        # Each window is scaled once into a per-utterance buffer, so emitting a chunk is a view
+        # of the samples so far; Whisper only sees 30 seconds, so that is the cap
+        scale = np.float32(1.0 / 32768.0)
+        utterance = None
+        write_pos = 0
+        read_windows = 0
+
         while True:
-            data = stream.read(160, exception_on_overflow=False)
-            is_speech = vad.is_speech(data, 16000)
+            await windows_ready.acquire()
+            if read_windows >= captured_windows:
+                continue  # already consumed when skipping past an overrun
+            if captured_windows - read_windows > ring_windows:
+                # Processing fell behind and the oldest windows were overwritten
+                read_windows = captured_windows - ring_windows
+                onset_windows = 0
+            start = (read_windows % ring_windows) * window_samples
+            read_windows += 1
+
+            is_speech = vad.is_speech(ring[start:start + window_samples].tobytes(), 16000)
 
+            # Silence -> onset -> speaking: a lone speech window (a click or a pop) is not enough
+            # to start an utterance and trigger a transcription
             if is_speech:
                 silent_time = 0
-                is_speaking = True
+                if not is_speaking:
+                    onset_windows += 1
+                    is_speaking = onset_windows >= min_onset_windows
             elif is_speaking:
-                silent_time += 160 / 16000.0
+                silent_time += window_samples / 16000.0
+            else:
+                onset_windows = 0
 
             if is_speaking:
-                buffer.append(data)
-                speaking_time += 160 / 16000.0
-                if silent_time >= min_silent_duration:
-                    audio_data = np.frombuffer(b''.join(buffer), dtype=np.int16).astype(np.float32) / np.iinfo(np.int16).max
-                    if len(audio_data) < 16000 * min_duration:
-                        padding = np.zeros(16000 * min_duration - len(audio_data), dtype=np.float32)
-                        audio_data = np.concatenate([audio_data, padding])
-
+                if write_pos == 0:
+                    # A fresh buffer per utterance keeps chunks already handed off immutable
+                    utterance = np.empty(16000 * max_duration, dtype=np.float32)
+                    # The onset windows are still in the ring, so the utterance starts with them
+                    first_window = read_windows - onset_windows
+                    onset_windows = 0
+                else:
+                    first_window = read_windows - 1
+                for index in range(first_window, read_windows):
+                    start = (index % ring_windows) * window_samples
+                    np.multiply(ring[start:start + window_samples], scale, out=utterance[write_pos:write_pos + window_samples])
+                    write_pos += window_samples
+                    speaking_time += window_samples / 16000.0
+                if silent_time >= min_silent_duration or write_pos + window_samples > len(utterance):
                     # Submit final chunk with a finalization flag
-                    callback((source_name, audio_data, source_language, destination_language, True))
+                    callback((source_name, utterance[:write_pos], source_language, destination_language, True))
 
-                    buffer = []
+                    write_pos = 0
                     is_speaking = False
                 elif speaking_time >= time_threshold:
-                    audio_data = np.frombuffer(b''.join(buffer), dtype=np.int16).astype(np.float32) / np.iinfo(np.int16).max
-                    callback((source_name, audio_data, source_language, destination_language, False))
+                    callback((source_name, utterance[:write_pos], source_language, destination_language, False))
             else:
                 speaking_time = 0
 
-    except Exception as e:
-        error_callback(e)
-
     finally:
-        stream.stop_stream()
-        stream.close()
-        p.terminate()
+        if stream is not None:
+            stream.stop_stream()
+            stream.close()
+
+def translate_texts(translation_pipeline, source_language: str, destination_language: str, texts: List[str]) -> List[str]:
+    """
+    Translate texts, reusing cached translations of identical text for the language pair.
+
+    Args:
+        translation_pipeline: The translation pipeline for the language pair.
+        source_language (str): The language of the texts.
+        destination_language (str): The language to translate to.
+        texts (List[str]): The texts to translate.
+
+    Returns:
+        List[str]: The translations, in the same order as the texts.
+    """
+    translations = [None] * len(texts)
+    missing = {}
+    for i, text in enumerate(texts):
+        key = (source_language, destination_language, text)
+        if key in _translation_cache:
+            _translation_cache.move_to_end(key)
+            translations[i] = _translation_cache[key]
+        else:
+            missing.setdefault(text, []).append(i)
+
+    if missing:
+        results = translation_pipeline(list(missing), batch_size=len(missing))
+        for (text, indices), result in zip(missing.items(), results):
+            translation = result['translation_text']
+            _translation_cache[(source_language, destination_language, text)] = translation
+            if len(_translation_cache) > TRANSLATION_CACHE_SIZE:
+                _translation_cache.popitem(last=False)
+            for i in indices:
+                translations[i] = translation
+
+    return translations
 
 def process_audio_streaming(
-    audio_data: np.ndarray,
-    source_name: str,
-    source_language: str,
-    destination_language: str,
-    transcription_model: WhisperForConditionalGeneration,
-    processor: WhisperProcessor,
-    translation_pipeline,
-    message_queue: queue.Queue,
-    final: bool = False
+    batch: List[Tuple[str, np.ndarray, str, str, bool]],
+    models: Dict[int, Dict[str, object]],
+    message_queue: NotifiableDeque
 ) -> None:
     """
-    Process the captured audio stream, including transcription and translation.
+    Process a batch of captured audio chunks, including transcription and translation.
+
+    Every chunk in the batch must share the same source language. All chunks are
+    transcribed with a single Whisper generate call, and the transcriptions are
+    translated with one batched call per translation pipeline.
     """
     try:
+        source_language = batch[0][2]
+        # Sources in a batch share a language, and so a decoder prompt, and all sources share
+        # one Whisper model, so any of them can serve the batch
+        model_info = models[batch[0][0]]
+        transcription_model = model_info['transcription_model']
+        processor = model_info['processor']
+
+        # The feature extractor pads to Whisper's 30 second window and masks the padding
         inputs = processor(
-            audio_data,
+            [audio_data for _, audio_data, _, _, _ in batch],
             return_tensors="pt",
             sampling_rate=16000,
-            return_attention_mask=True,
-            language=source_language
+            return_attention_mask=True
         )
 
-        input_features = inputs.input_features.to(transcription_model.device)
+        input_features = inputs.input_features.to(transcription_model.device, dtype=transcription_model.dtype)
         attention_mask = inputs.attention_mask.to(transcription_model.device)
 
-        generated_ids = transcription_model.generate(
-            input_features=input_features,
-            attention_mask=attention_mask,
-            task='transcribe',
-            language=source_language
-        )
+        with torch.inference_mode():
+            generated_ids = transcription_model.generate(
+                input_features=input_features,
+                attention_mask=attention_mask,
+                forced_decoder_ids=model_info['forced_decoder_ids'],
+                max_new_tokens=224,
+                num_beams=1,
+                do_sample=False
+            )
+
+            transcriptions = processor.batch_decode(generated_ids, skip_special_tokens=True)
 
-        transcription = processor.batch_decode(generated_ids, skip_special_tokens=True)[0]
+            # Group the transcriptions by language pair so each pipeline runs once
+            translation_groups = {}
+            for i, (_, _, _, destination_language, _) in enumerate(batch):
+                translation_groups.setdefault(destination_language, []).append(i)
 
-        translation = translation_pipeline(transcription)[0]['translation_text']
+            translations = [None] * len(batch)
+            for destination_language, indices in translation_groups.items():
+                translation_pipeline = models[batch[indices[0]][0]]['translation_pipeline']
+                texts = translate_texts(
+                    translation_pipeline,
+                    source_language,
+                    destination_language,
+                    [transcriptions[i] for i in indices]
+                )
+                for i, translation in zip(indices, texts):
+                    translations[i] = translation
 
-        message_queue.put((source_name, "Transcription", transcription, "left", final))
-        message_queue.put((source_name, "Translation", translation, "right", final))
+        for (source_name, _, _, _, final), transcription, translation in zip(batch, transcriptions, translations):
+            if final:
+                _last_interim.pop(source_name, None)
+            elif _last_interim.get(source_name) == transcription:
+                continue  # nothing new to show for this partial utterance
+            else:
+                _last_interim[source_name] = transcription
+            message_queue.append((source_name, "Transcription", transcription, "left", final))
+            message_queue.append((source_name, "Translation", translation, "right", final))
 
     except Exception as e:
         error_message = f"Error processing audio: {format_error_message(e)}"
-        message_queue.put((source_name, None, error_message, "left", True))
+        for source_name, _, _, _, _ in batch:
+            message_queue.append((source_name, None, error_message, "left", True))
 
-def process_queue(
+async def process_queue(
     executor: ThreadPoolExecutor,
     models: Dict[int, Dict[str, object]],
-    processing_queue: queue.Queue,
-    message_queue: queue.Queue
+    pending_audio: AudioCoalescer,
+    message_queue: NotifiableDeque
 ) -> None:
-    processing_threads = {}
+    """
+    Transcribe and translate pending audio on the executor, one batch at a time.
+
+    Audio captured while a batch is being processed is coalesced by pending_audio.
+
+    Args:
+        executor (ThreadPoolExecutor): Single-worker executor that owns the models' device.
+        models (Dict[int, Dict[str, object]]): The loaded models keyed by source name.
+        pending_audio (AudioCoalescer): The source of captured audio chunks.
+        message_queue (NotifiableDeque): Deque receiving the messages to display.
+    """
+    loop = asyncio.get_running_loop()
     while True:
         try:
-            # Get the next message, blocking until one is available
-            source_name, audio_data, source_language, destination_language, final = processing_queue.get()
-
-            model_info = models[source_name]
-
-            # If a thread is currently processing for this source, check for other messages
-            if source_name in processing_threads and processing_threads[source_name].is_alive():
-                found_final = final
-                next_message = None
-                current_message = (source_name, audio_data, source_language, destination_language, final)
-                for _ in range(processing_queue.qsize()):
-                    next_source_name, next_audio_data, next_source_language, next_destination_language, next_final = processing_queue.get()
-                    if next_source_name != source_name or found_final:
-                        if next_source_name in processing_threads and processing_threads[next_source_name].is_alive():
-                            processing_queue.put((next_source_name, next_audio_data, next_source_language, next_destination_language, next_final))
-                        else:
-                            next_message = (next_source_name, next_audio_data, next_source_language, next_destination_language, next_final)
-                    else:
-                        if next_final:
-                            found_final = True
-                        current_message = (next_source_name, next_audio_data, next_source_language, next_destination_language, next_final)
-
-                processing_queue.queue.appendleft(current_message)
-                if next_message is not None:
-                    processing_queue.queue.appendleft(next_message)
-
-                time.sleep(0.001)
-                continue
-
-            processing_threads[source_name] = threading.Thread(
-                target=process_audio_streaming,
-                args=(
-                    audio_data,
-                    source_name,
-                    source_language,
-                    destination_language,
-                    model_info['transcription_model'],
-                    model_info['processor'],
-                    model_info['translation_pipeline'],
-                    message_queue,
-                    final
-                )
-            )
-            processing_threads[source_name].start()
+            # Whisper shares one tokenizer across languages, but the language prompt is per batch
+            batches = {}
+            for message in await pending_audio.take(MAX_BATCH_SIZE):
+                batches.setdefault(message[2], []).append(message)
+
+            for language_batch in batches.values():
+                await loop.run_in_executor(executor, process_audio_streaming, language_batch, models, message_queue)
 
         except Exception as e:
             print(f"Error in process_queue: {e}")
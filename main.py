@@ -1,13 +1,13 @@
+import asyncio
 import curses
 import threading
-import queue
 import sys
-import time
 from typing import Dict, List
 from audio_config import select_audio_sources_and_languages
-from audio_processing import capture_audio, load_models, process_queue
+from audio_processing import AudioCoalescer, capture_audio, load_models, process_queue
 from terminal_interface import writer_thread, cleanup, display_intro
-from concurrent.futures import ThreadPoolExecutor
+from utils import NotifiableDeque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from transformers import logging
 import torch
 
@@ -23,6 +23,8 @@ def setup_model_output_to_ncurses(stdscr: curses.window, sources: List[Dict]) ->
         Dict[int, Dict[str, object]]: A dictionary of loaded models keyed by source index.
     """
     try:
+        # The log takes two lines per source, so let it scroll instead of failing at the last row
+        stdscr.scrollok(True)
         logging.set_verbosity_error()
         # Determine the main device for hardware acceleration (GPU if available)
         device = torch.device("cuda" if torch.cuda.is_available() else "mps" if torch.backends.mps.is_available() else "cpu")
@@ -30,26 +32,26 @@ def setup_model_output_to_ncurses(stdscr: curses.window, sources: List[Dict]) ->
         stdscr.refresh()
 
         models = {}
-        for source in sources:
-            stdscr.addstr(f"Setting up models for {source['source_name']} (from {source['source_language']} to {source['destination_language']})...\n")
-            stdscr.refresh()
-
-            # Load models and store them in the dictionary using the correct index
-            transcription_model, processor, translation_pipeline = load_models(
-                source["source_language"], source["destination_language"], device=device
-            )
-            models[source['source_name']] = {
-                "transcription_model": transcription_model,
-                "processor": processor,
-                "translation_pipeline": translation_pipeline
-            }
-            stdscr.addstr(f"Models for {source['source_name']} are ready.\n")
+        # Loading is mostly disk and network I/O, so sources are set up concurrently
+        with ThreadPoolExecutor(max_workers=min(4, len(sources))) as executor:
+            futures = {}
+            for source in sources:
+                stdscr.addstr(f"Setting up models for {source['source_name']} (from {source['source_language']} to {source['destination_language']})...\n")
+                # Each source can add a chunk to a batch, so warm Whisper up for up to len(sources)
+                futures[executor.submit(load_models, source["source_language"], source["destination_language"], device, len(sources))] = source
             stdscr.refresh()
 
-            # Add a short delay to ensure output is visible
-            time.sleep(1)
-            stdscr.clear()
-            stdscr.refresh()
+            for future in as_completed(futures):
+                source = futures[future]
+                transcription_model, processor, translation_pipeline, forced_decoder_ids = future.result()
+                models[source['source_name']] = {
+                    "transcription_model": transcription_model,
+                    "processor": processor,
+                    "translation_pipeline": translation_pipeline,
+                    "forced_decoder_ids": forced_decoder_ids
+                }
+                stdscr.addstr(f"Models for {source['source_name']} are ready.\n")
+                stdscr.refresh()
 
         return models
 
@@ -58,7 +60,39 @@ def setup_model_output_to_ncurses(stdscr: curses.window, sources: List[Dict]) ->
         print(f"An error occurred during model setup: {str(e)}")
         sys.exit(1)
 
-def curses_main(stdscr: curses.window, models: Dict[int, Dict[str, object]], sources: List[Dict], error_queue: queue.Queue) -> None:
+async def main_async(stdscr: curses.window, models: Dict[int, Dict[str, object]], sources: List[Dict], message_queue: NotifiableDeque) -> None:
+    """
+    Capture and process audio from every source until one of them fails.
+
+    Args:
+        stdscr (curses.window): The ncurses window object.
+        models (Dict[int, Dict[str, object]]): The dictionary of loaded models keyed by source index.
+        sources (List[Dict]): The list of audio sources and languages.
+        message_queue (NotifiableDeque): The deque of messages to display.
+    """
+    pending_audio = AudioCoalescer()
+
+    # A single worker owns the models so batches never compete for the device
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        tasks = [process_queue(executor, models, pending_audio, message_queue)]
+        for source in sources:
+            model_info = models.get(source['source_name'])
+            if model_info:
+                tasks.append(capture_audio(
+                    source['index'],
+                    source['source_name'],
+                    source['source_language'],
+                    source['destination_language'],
+                    pending_audio.put
+                ))
+            else:
+                stdscr.addstr(0, 0, f"No model found for source index: {source['index']}")
+                stdscr.refresh()
+
+        # The first capture error propagates here; asyncio.run cancels the remaining tasks
+        await asyncio.gather(*tasks)
+
+def curses_main(stdscr: curses.window, models: Dict[int, Dict[str, object]], sources: List[Dict]) -> None:
     """
     Main curses loop, handling the interface and real-time processing.
 
@@ -66,54 +100,22 @@ def curses_main(stdscr: curses.window, models: Dict[int, Dict[str, object]], sou
         stdscr (curses.window): The ncurses window object.
         models (Dict[int, Dict[str, object]]): The dictionary of loaded models keyed by source index.
         sources (List[Dict]): The list of audio sources and languages.
-        error_queue (queue.Queue): The queue for handling errors.
     """
-    message_queue = queue.Queue()
-    processing_queue = queue.Queue()
+    message_queue = NotifiableDeque()
+    shutdown_event = threading.Event()
 
-    writer = threading.Thread(target=writer_thread, args=(stdscr, message_queue))
+    writer = threading.Thread(target=writer_thread, args=(stdscr, message_queue, shutdown_event))
     writer.daemon = True
     writer.start()
 
-    threads = []
     try:
-        with ThreadPoolExecutor() as executor:
-            processing_thread = threading.Thread(target=process_queue, args=(executor, models, processing_queue, message_queue))
-            processing_thread.start()
-
-            for source in sources:
-                model_info = models.get(source['source_name'])
-                if model_info:
-                    thread = threading.Thread(
-                        target=capture_audio,
-                        args=(
-                            source['index'],
-                            source['source_name'],
-                            source['source_language'],
-                            source['destination_language'],
-                            processing_queue.put,
-                            lambda e: error_queue.put(e),
-                            executor
-                        )
-                    )
-                    thread.start()
-                    threads.append(thread)
-                else:
-                    stdscr.addstr(0, 0, f"No model found for source index: {source['index']}")
-                    stdscr.refresh()
-
-            while any(thread.is_alive() for thread in threads):
-                try:
-                    error = error_queue.get()
-                    if error:
-                        raise error
-                except queue.Empty:
-                    pass  # Continue checking thread statuses
-
-            for thread in threads:
-                thread.join()
-
-            processing_thread.join()
+        try:
+            asyncio.run(main_async(stdscr, models, sources, message_queue))
+        finally:
+            # Stop the writer before the terminal is restored, including on Ctrl-C
+            shutdown_event.set()
+            message_queue.notify()
+            writer.join(timeout=1)
 
     except Exception as e:
         cleanup(stdscr)
@@ -132,6 +134,7 @@ def main(stdscr: curses.window) -> None:
     stdscr.keypad(True)
     display_intro(stdscr)
 
+    # Shows the intro and this line in a single update
     stdscr.addstr("Loading languages...\n")
     stdscr.refresh()
 
@@ -142,9 +145,7 @@ def main(stdscr: curses.window) -> None:
 
     models = setup_model_output_to_ncurses(stdscr, sources)
 
-    error_queue = queue.Queue()
-
-    curses_main(stdscr, models, sources, error_queue)
+    curses_main(stdscr, models, sources)
 
 if __name__ == "__main__":
     try:
@@ -1,18 +1,11 @@
-import pyaudio
+from audio_config import list_devices
 
-# Initialize PyAudio
-p = pyaudio.PyAudio()
+# List all audio devices of the first host API; PortAudio numbers devices one host API after
+# another, so a device's position in this list is its index within the host API
+host_api_devices = [device_info for device_info in list_devices() if device_info.get('hostApi') == 0]
 
-# List all audio devices
-info = p.get_host_api_info_by_index(0)
-num_devices = info.get('deviceCount')
-
-for i in range(num_devices):
-    device_info = p.get_device_info_by_host_api_device_index(0, i)
+for i, device_info in enumerate(host_api_devices):
     if device_info.get('maxInputChannels') > 0:
         print(f"Input Device Index {i}: {device_info.get('name')}")
     if device_info.get('maxOutputChannels') > 0:
         print(f"Output Device Index {i}: {device_info.get('name')}")
-
-# Terminate PyAudio
-p.terminate()
@@ -1,10 +1,23 @@
+import bisect
 import curses
-import queue
+import threading
+import unicodedata
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+from typing import Sequence
+
+import numpy as np
+
+from utils import NotifiableDeque
 
 def display_intro(stdscr: curses.window) -> None:
     """
     Display the introductory message in the ncurses window.
 
+    The message is only staged; it reaches the terminal with the caller's next refresh,
+    together with whatever the caller adds below it.
+
     Args:
         stdscr (curses.window): The ncurses window object.
     """
@@ -21,12 +34,67 @@ def display_intro(stdscr: curses.window) -> None:
     )
     stdscr.clear()
     stdscr.addstr(0, 0, intro_text)
-    stdscr.refresh()
+    stdscr.noutrefresh()
+
+@lru_cache(maxsize=65536)
+def char_width(char: str) -> int:
+    """
+    Get the number of terminal columns a character occupies.
+
+    Args:
+        char (str): A single character.
+
+    Returns:
+        int: 0 for combining marks, 2 for wide and fullwidth characters (CJK), otherwise 1.
+    """
+    if unicodedata.combining(char):
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+
+@lru_cache(maxsize=None)
+def bmp_width_table() -> np.ndarray:
+    """
+    Get the column width of every Basic Multilingual Plane code point, built on first use.
+
+    Returns:
+        np.ndarray: The width of each code point from U+0000 to U+FFFF.
+    """
+    # Bypass char_width's cache, which would otherwise fill up with the whole plane
+    return np.fromiter(
+        (char_width.__wrapped__(chr(codepoint)) for codepoint in range(0x10000)),
+        dtype=np.int64,
+        count=0x10000
+    )
+
+def column_offsets(text: str) -> Sequence[int]:
+    """
+    Get the display column at which each character of a string starts.
+
+    Args:
+        text (str): The text to measure.
+
+    Returns:
+        Sequence[int]: len(text) + 1 non-decreasing offsets; the last one is the display width.
+    """
+    if text.isascii():
+        return range(len(text) + 1)
+
+    # Look every character up in the width table at once, then add the widths up
+    codepoints = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    widths = bmp_width_table()[np.minimum(codepoints, 0xFFFF)]
+    for i in np.flatnonzero(codepoints > 0xFFFF):
+        widths[i] = char_width(text[i])
+    offsets = np.zeros(len(text) + 1, dtype=np.int64)
+    np.cumsum(widths, out=offsets[1:])
+    # The wrap loop indexes and bisects these one at a time, which is faster on a list
+    return offsets.tolist()
 
 def wrap_text(text: str, width: int, start_pos: int = 0) -> list[str]:
     """
     Wrap text to fit within a specified width.
 
+    Widths are measured in terminal columns, so wide (CJK) characters count as two.
+
     Args:
         text (str): The text to wrap.
         width (int): The width to wrap the text to.
@@ -35,152 +103,341 @@ def wrap_text(text: str, width: int, start_pos: int = 0) -> list[str]:
     Returns:
         list[str]: A list of strings, each representing a line of wrapped text.
     """
+    # Walk each paragraph by offset rather than re-slicing the remainder for every line
+    width = max(width, 1)
     lines = []
     for paragraph in text.splitlines():
-        while len(paragraph) > width or (len(lines) == 0 and len(paragraph) > width - start_pos):
+        offsets = column_offsets(paragraph)
+        start = 0
+        end = len(paragraph)
+        while offsets[end] - offsets[start] > width or (
+            len(lines) == 0 and offsets[end] - offsets[start] > width - start_pos
+        ):
             if len(lines) == 0 and start_pos > 0:
-                space_pos = paragraph.rfind(' ', 0, width - start_pos)
+                limit = bisect.bisect_right(offsets, offsets[start] + width - start_pos) - 1
+                space_pos = paragraph.rfind(' ', start, limit)
                 if space_pos == -1:
-                    space_pos = 0
+                    space_pos = start
             else:
-                space_pos = paragraph.rfind(' ', 0, width)
+                # The most characters that fit, but always at least one
+                limit = max(bisect.bisect_right(offsets, offsets[start] + width) - 1, start + 1)
+                space_pos = paragraph.rfind(' ', start, limit)
                 if space_pos == -1:
-                    space_pos = width
-            lines.append(paragraph[:space_pos])
-            paragraph = paragraph[space_pos:].lstrip()
-        if len(paragraph) > 0:
-            lines.append(paragraph)
+                    space_pos = limit
+            lines.append(paragraph[start:space_pos])
+            # Continue from the next non-whitespace character
+            start = space_pos
+            while start < end and paragraph[start].isspace():
+                start += 1
+        if start < end:
+            lines.append(paragraph[start:])
     return lines
 
-def find_matching_message(messages, source, label, final):
+def wrap_message(msg: dict, width: int) -> list[str]:
+    """
+    Get a message's text wrapped to a width, re-wrapping only when the text or width changed.
+
+    Args:
+        msg (dict): The message dictionary; the wrapped lines are cached on it.
+        width (int): The width to wrap the text to.
+
+    Returns:
+        list[str]: A list of strings, each representing a line of wrapped text.
+    """
+    if msg.get("wrap_width") != width or msg.get("wrapped_text") is not msg["text"]:
+        msg["wrapped"] = wrap_text(msg["text"], width)
+        msg["wrap_width"] = width
+        msg["wrapped_text"] = msg["text"]
+    return msg["wrapped"]
+
+def message_index_keys(msg: dict) -> list:
     """
-    Find the index of the matching message in the list.
+    Get the keys a message is indexed under.
+
+    Every message is indexed under (source, None, final), which serves lookups for any
+    label, and under (source, label, final) when it has a label.
 
     Args:
-        messages (list): List of message dictionaries.
+        msg (dict): The message dictionary.
+
+    Returns:
+        list: The index keys of the message.
+    """
+    keys = [(msg["source"], None, msg["final"])]
+    if msg["label"] is not None:
+        keys.append((msg["source"], msg["label"], msg["final"]))
+    return keys
+
+def index_message(index: dict, msg: dict) -> None:
+    """
+    Add a message to a side's lookup index.
+
+    Args:
+        index (dict): The side's index, mapping keys to messages in screen order.
+        msg (dict): The message dictionary.
+    """
+    for key in message_index_keys(msg):
+        index.setdefault(key, []).append(msg)
+
+def unindex_message(index: dict, msg: dict) -> None:
+    """
+    Remove a message from a side's lookup index.
+
+    Args:
+        index (dict): The side's index, mapping keys to messages in screen order.
+        msg (dict): The message dictionary.
+    """
+    for key in message_index_keys(msg):
+        matches = index[key]
+        matches[:] = [match for match in matches if match is not msg]
+        if not matches:
+            del index[key]
+
+def find_matching_message(index, source, label, final):
+    """
+    Find the first matching message on a side.
+
+    Args:
+        index (dict): The side's index, mapping keys to messages in screen order.
         source (str): The source of the message to find.
-        label (str): The label of the message to find.
+        label (str): The label of the message to find, or None to match any label.
         final (bool): Whether to find a final or non-final message.
 
     Returns:
-        int: The index of the matching message, or -1 if not found.
+        dict: The matching message, or None if not found.
+    """
+    matches = index.get((source, label, final))
+    return matches[0] if matches else None
+
+MAX_MESSAGES_PER_FRAME = 32  # bounds the latency of a single redraw
+MAX_HISTORY = 256  # messages kept per side, whether or not they are still on screen
+PAD_LINES = 1024  # rows in each column's pad; must exceed the terminal height
+
+def coalesce_messages(messages: list) -> list:
+    """
+    Drop interim messages that a later message in the same batch supersedes.
+
+    A later message for the same source, label and side replaces a pending interim
+    message in place, so relative order is kept. Final messages are never dropped.
+
+    Args:
+        messages (list): The (source, label, text, side, final) messages in arrival order.
+
+    Returns:
+        list: The messages that still need to be applied.
     """
-    for i, msg in enumerate(messages):
-        if msg["source"] == source and (msg["label"] == label or label == None) and msg["final"] == final:
-            return i
-    return -1
+    coalesced = []
+    interim_slots = {}
+    for message in messages:
+        source, label, _, side, final = message
+        key = (source, label, side)
+        slot = interim_slots.pop(key, None)
+        if slot is None:
+            slot = len(coalesced)
+            coalesced.append(message)
+        else:
+            coalesced[slot] = message
+        if not final:
+            interim_slots[key] = slot
+    return coalesced
 
-def writer_thread(stdscr: curses.window, message_queue: queue.Queue) -> None:
+def place_message(message_positions: dict, message_index: dict, message: tuple, wrap_width: int) -> int:
+    """
+    Update the matching interim message or append a new one.
+
+    Rows are absolute (not adjusted for scrolling), and each side stays in screen order
+    with a blank line between messages, so a side's last message is its bottom edge.
+
+    Args:
+        message_positions (dict): The messages on each side of the screen, as deques.
+        message_index (dict): The lookup index of each side's messages.
+        message (tuple): The (source, label, text, side, final) message to place.
+        wrap_width (int): The width that message text is wrapped to.
+
+    Returns:
+        int: The first absolute row affected by the change, or None if nothing visible changed.
+    """
+    source, label, text, side, final = message
+    side_messages = message_positions[side]
+
+    # Update the existing non-final message
+    match = find_matching_message(message_index[side], source, label, False)
+    if match is not None:
+        unindex_message(message_index[side], match)
+        match["final"] = final
+        if match["text"] == text:
+            # Typically an interim finalized with the same text; only the index changes
+            index_message(message_index[side], match)
+            return None
+        match["text"] = text
+        wrapped_lines = wrap_message(match, wrap_width)
+        delta = len(wrapped_lines) + 2 - match["lines"]
+        match["lines"] += delta
+        match["y_pos_end"] += delta
+        index_message(message_index[side], match)
+
+        # Push the messages below it on this side down if it grew into them
+        if delta > 0 and side_messages[-1] is not match:
+            position = len(side_messages) - 2
+            while side_messages[position] is not match:
+                position -= 1
+            overlap = match["y_pos_end"] + 2 - side_messages[position + 1]["y_pos_start"]
+            if overlap > 0:
+                for msg in islice(side_messages, position + 1, None):
+                    msg["y_pos_start"] += overlap
+                    msg["y_pos_end"] += overlap
+        return match["y_pos_start"]
+
+    # Place it below the current side's messages, leaving a blank line
+    y_pos_start = side_messages[-1]["y_pos_end"] + 2 if side_messages else 0
+
+    # Keep it level with, or below, the same source's latest message on the other side
+    opposite_side = "left" if side == "right" else "right"
+    for opposite_final in (False, True):
+        matches = message_index[opposite_side].get((source, None, opposite_final))
+        if matches:
+            y_pos_start = max(y_pos_start, matches[-1]["y_pos_start"])
+    match_opposite = find_matching_message(message_index[opposite_side], source, None, True)
+    if len(message_positions[opposite_side]) > 1 and match_opposite is not None:
+        y_pos_start = max(y_pos_start, match_opposite["y_pos_end"] + 2)
+
+    msg = {
+        "source": source,
+        "label": label,
+        "text": text,
+        "final": final
+    }
+    wrapped_lines = wrap_message(msg, wrap_width)
+    msg["lines"] = len(wrapped_lines) + 2
+    msg["y_pos_start"] = y_pos_start
+    msg["y_pos_end"] = y_pos_start + len(wrapped_lines)
+    if len(side_messages) == side_messages.maxlen:
+        # The oldest message is dropped to make room
+        unindex_message(message_index[side], side_messages[0])
+    side_messages.append(msg)
+    index_message(message_index[side], msg)
+
+    return y_pos_start
+
+def writer_thread(stdscr: curses.window, message_queue: NotifiableDeque, shutdown_event: threading.Event) -> None:
     """
     Continuously retrieves messages from the queue and displays them in the terminal window.
 
     Args:
         stdscr (curses.window): The curses window object.
-        message_queue (queue.Queue): Queue from which messages are retrieved.
+        message_queue (NotifiableDeque): Deque from which messages are retrieved.
+        shutdown_event (threading.Event): Set, followed by message_queue.notify(), to stop the thread.
     """
     stdscr.scrollok(True)
     message_positions = {
-        "left": [],
-        "right": []
+        "left": deque(maxlen=MAX_HISTORY),
+        "right": deque(maxlen=MAX_HISTORY)
+    }
+    # (source, label, final) -> messages in screen order, so lookups don't scan every message
+    message_index = {
+        "left": {},
+        "right": {}
     }
+    # Absolute row shown at the top of the screen
     scroll_offset = 0
+    # Each column is drawn into its own pad, which holds rows from pad_origin down and is
+    # recreated when the terminal width changes
+    pads = {}
+    pad_width = None
+    pad_origin = 0
 
-    while True:
-        try:
-            source, label, text, side, final = message_queue.get()
-
-            # Find the message to update or append a new one
-            found_message = False
-            match_index = find_matching_message(message_positions[side], source, label, False)
-            if match_index != -1:
-                wrapped_lines = wrap_text(text, stdscr.getmaxyx()[1] // 2 - 2)
-
-                # Update the existing non-final message
-                message_positions[side][match_index]["text"] = text
-                message_positions[side][match_index]["final"] = final
-                message_positions[side][match_index]["lines"] = len(wrapped_lines) + 2
-                y_pos_start = message_positions[side][match_index]["y_pos_start"]
-                message_positions[side][match_index]["y_pos_end"] = y_pos_start + len(wrapped_lines)
-                found_message = True
-
-            if not found_message:
-                # Calculate y_pos_start based on the maximum y_pos_end + 2 for the current side's messages
-                y_pos_start = max(
-                    (msg["y_pos_end"] for msg in message_positions[side]),
-                    default=-1
-                ) + 1
-
-                # Calculate y_pos_start based on the other side's last matching message if it's greater
-                opposite_side = "left" if side == "right" else "right"
-                matching_index_opposite = find_matching_message(message_positions[opposite_side], source, None, True)
-                y_pos_start = max(
-                    y_pos_start,
-                    max(
-                        (msg["y_pos_start"] for msg in message_positions[opposite_side] if msg["source"] == source),
-                        default=0
-                    )
-                )
-                if len(message_positions[opposite_side]) > 1 and matching_index_opposite != -1:
-                    y_pos_start = max(
-                        y_pos_start,
-                        message_positions[opposite_side][matching_index_opposite]["y_pos_end"] + 1
-                    )
-
-                wrapped_lines = wrap_text(text, stdscr.getmaxyx()[1] // 2 - 2)
-
-                message_positions[side].append({
-                    "source": source,
-                    "label": label,
-                    "text": text,
-                    "final": final,
-                    "lines": len(wrapped_lines) + 2,
-                    "y_pos_start": y_pos_start,
-                    "y_pos_end": y_pos_start + len(wrapped_lines)
-                })
-
-            # Recalculate total lines after updating or adding a new message
+    try:
+        while not shutdown_event.is_set():
+            # Apply everything queued so far, then render once
+            message = message_queue.popleft_blocking(shutdown_event)
+            if message is None:
+                break
+            messages = [message]
+            while message_queue and len(messages) < MAX_MESSAGES_PER_FRAME:
+                messages.append(message_queue.popleft())
+
+            # The screen size is read once per frame; each side's (x position, drawn width,
+            # wrap width) is shared by placing and drawing, so every message is wrapped once
+            height, width = stdscr.getmaxyx()
+            mid_x = width // 2
+            columns = {
+                "left": (0, mid_x - 1, mid_x - 2),
+                "right": (mid_x + 1, width - mid_x - 2, width - mid_x - 2)
+            }
+            dirty_rows = [
+                place_message(message_positions, message_index, message, columns[message[3]][2])
+                for message in coalesce_messages(messages)
+            ]
+            dirty_row = min((row for row in dirty_rows if row is not None), default=None)
+            if dirty_row is None:
+                continue  # nothing visible changed, so there is nothing to redraw
+
+            # Each side's last message is its bottom edge
             total_lines = max(
-                max((msg["y_pos_end"] for msg in message_positions["left"]), default=0),
-                max((msg["y_pos_end"] for msg in message_positions["right"]), default=0)
+                message_positions[side][-1]["y_pos_end"] if message_positions[side] else 0
+                for side in ["left", "right"]
             )
 
             # Handle scrolling if needed
-            max_y, _ = stdscr.getmaxyx()
-            max_y -= 1
-            if total_lines > max_y:
+            max_y = height - 1
+            if total_lines - scroll_offset > max_y:
+                # Scrolling only moves the pads' viewport; nothing has to be redrawn for it
                 scroll_offset = total_lines - max_y
 
-            # Clear the screen and recalculate all positions for both sides
-            stdscr.clear()
-            height, width = stdscr.getmaxyx()
-            mid_x = width // 2
+            if width != pad_width:
+                # One spare column, so a full-width line never wraps the cursor
+                pads = {side: curses.newpad(PAD_LINES, columns[side][1] + 1) for side in columns}
+                for pad in pads.values():
+                    pad.scrollok(True)
+                pad_width = width
+                pad_origin = scroll_offset
+                dirty_row = scroll_offset
+                # Blank the gutters, which no pad covers
+                stdscr.erase()
+                stdscr.noutrefresh()
+            elif scroll_offset + height - pad_origin >= PAD_LINES:
+                # Out of room at the bottom of the pads: drop the rows above the screen
+                for pad in pads.values():
+                    pad.scroll(scroll_offset - pad_origin)
+                pad_origin = scroll_offset
 
-            for side in ["left", "right"]:
-                for msg in message_positions[side]:
-                    y_pos = msg["y_pos_start"] - scroll_offset
-                    x_pos = 0 if side == "left" else mid_x + 1
-                    wrapped_lines = wrap_text(msg["text"], mid_x - 2 if side == "left" else width - mid_x - 2)
-                    if y_pos >= 0:
-                        stdscr.addstr(y_pos, x_pos, f"{msg['source']} ({msg['label']}):", curses.A_BOLD)
+            # Only rows from the changed message down are cleared and redrawn; curses diffs
+            # the rest against what is already on the terminal
+            dirty_row = max(dirty_row, scroll_offset)
+            for side, pad in pads.items():
+                _, column_width, wrap_width = columns[side]
+                pad.move(dirty_row - pad_origin, 0)
+                pad.clrtobot()
+                # Only the messages between the cleared region and the bottom of the screen
+                side_messages = message_positions[side]
+                first = bisect.bisect_left(side_messages, dirty_row, key=lambda msg: msg["y_pos_end"])
+                last = bisect.bisect_left(side_messages, scroll_offset + height, key=lambda msg: msg["y_pos_start"])
+                for msg in islice(side_messages, first, last):
+                    y_pos = msg["y_pos_start"] - pad_origin
+                    wrapped_lines = wrap_message(msg, wrap_width)
+                    if msg["y_pos_start"] >= dirty_row:
+                        pad.addnstr(y_pos, 0, f"{msg['source']} ({msg['label']}):", column_width, curses.A_BOLD)
                     for i, line in enumerate(wrapped_lines):
-                        if y_pos + i + 1 >= 0:
-                            stdscr.addstr(y_pos + i + 1, x_pos, line)
-                    msg["y_pos_start"] = y_pos
-                    msg["y_pos_end"] = y_pos + msg["lines"] - 1
+                        if msg["y_pos_start"] + i + 1 >= dirty_row:
+                            pad.addnstr(y_pos + i + 1, 0, line, column_width)
 
-            # Remove messages that are entirely off-screen
-            message_positions["left"] = [msg for msg in message_positions["left"] if msg["y_pos_end"] >= 0]
-            message_positions["right"] = [msg for msg in message_positions["right"] if msg["y_pos_end"] >= 0]
-            scroll_offset = 0
+            # Remove messages that have scrolled entirely off-screen (always the oldest ones)
+            for side in ["left", "right"]:
+                side_messages = message_positions[side]
+                while side_messages and side_messages[0]["y_pos_end"] < scroll_offset:
+                    unindex_message(message_index[side], side_messages.popleft())
 
-            stdscr.refresh()
+            for side, pad in pads.items():
+                x_pos, column_width, _ = columns[side]
+                pad.noutrefresh(scroll_offset - pad_origin, 0, 0, x_pos, max_y, x_pos + column_width - 1)
+            curses.doupdate()
 
-        except KeyboardInterrupt:
-            break
-        except Exception as e:
-            stdscr.addstr(height - 1, 0, f"Error in writer thread: {e}", curses.color_pair(1))
-            stdscr.refresh()
-            break
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        height = stdscr.getmaxyx()[0]
+        stdscr.addstr(height - 1, 0, f"Error in writer thread: {e}", curses.color_pair(1))
+        stdscr.refresh()
 
 def cleanup(stdscr: curses.window = None) -> None:
     """
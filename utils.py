@@ -1,4 +1,99 @@
+import os
+import threading
 import traceback
+from collections import deque
+from functools import lru_cache
+
+class NotifiableDeque:
+    """
+    A deque whose consumer can wait for items to be appended.
+
+    Appending to and popping from a deque are atomic, so a single consumer only needs an
+    Event to be woken, rather than the lock and condition variable queue.Queue takes on
+    every put and get.
+    """
+
+    def __init__(self) -> None:
+        self._items = deque()
+        self._event = threading.Event()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def append(self, item) -> None:
+        """
+        Append an item and wake the consumer.
+
+        Args:
+            item: The item to append.
+        """
+        self._items.append(item)
+        self._event.set()
+
+    def popleft(self):
+        """
+        Remove and return the oldest item.
+
+        Returns:
+            The oldest item. Raises IndexError if the deque is empty.
+        """
+        return self._items.popleft()
+
+    def popleft_blocking(self, stop_event: threading.Event = None):
+        """
+        Remove and return the oldest item, waiting for one to be appended if necessary.
+
+        The event is cleared before the deque is checked again, so an append that races
+        with the wait is never missed.
+
+        Args:
+            stop_event (threading.Event, optional): Stop waiting once this is set and the
+                consumer is woken with notify(). Defaults to None.
+
+        Returns:
+            The oldest item, or None if stop_event was set while the deque was empty.
+        """
+        while True:
+            try:
+                return self._items.popleft()
+            except IndexError:
+                if stop_event is not None and stop_event.is_set():
+                    return None
+                self._event.wait()
+                self._event.clear()
+
+    def notify(self) -> None:
+        """
+        Wake the consumer without appending an item.
+        """
+        self._event.set()
+
+def get_cache_dir() -> str:
+    """
+    Get the application's cache directory, creating it if necessary.
+
+    Returns:
+        str: The path of the cache directory.
+    """
+    base_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    cache_dir = os.path.join(base_dir, "realtime-translator")
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+@lru_cache(maxsize=128)
+def _format_tb_cached(tb_frames: tuple) -> str:
+    """
+    Format a traceback's frames, reading each source line only the first time it's seen.
+
+    Args:
+        tb_frames (tuple): The (filename, lineno, name) of each frame, outermost first.
+
+    Returns:
+        str: The formatted frames.
+    """
+    return ''.join(traceback.StackSummary.from_list(
+        [(filename, lineno, name, None) for filename, lineno, name in tb_frames]
+    ).format())
 
 def format_error_message(e: Exception) -> str:
     """
@@ -10,4 +105,16 @@ def format_error_message(e: Exception) -> str:
     Returns:
         str: A formatted string with the exception message and traceback.
     """
-    return ''.join(traceback.format_exception(type(e), e, e.__traceback__))
+    if e.__cause__ is not None or (e.__context__ is not None and not e.__suppress_context__):
+        # Chained exceptions are rare enough to format in full every time
+        return ''.join(traceback.format_exception(type(e), e, e.__traceback__))
+
+    # walk_tb only reads the frames, so a repeated error skips the linecache lookups
+    tb_frames = tuple(
+        (frame.f_code.co_filename, lineno, frame.f_code.co_name)
+        for frame, lineno in traceback.walk_tb(e.__traceback__)
+    )
+    message = ''.join(traceback.format_exception_only(type(e), e))
+    if not tb_frames:
+        return message
+    return "Traceback (most recent call last):\n" + _format_tb_cached(tb_frames) + message